@@ -38,11 +38,88 @@
 ### For example, as a word [1, 2, -1, -2] = aba'b' or (x_1)(x_2)(x_1)'(x_2)', and as an
 ### alphabet [1, 2, -1, -2] = {a, b, a', b'} or {x_1, x_2, (x_1)', (x_2)'}.
 ###
+### Internally, words are stored as bytes objects rather than lists: each letter
+### is encoded as its value modulo 256 (two's complement in a single byte), so
+### e.g. -1 is stored as the byte 255.  encodeWord and decodeWord convert between
+### the two forms.  This keeps words compact, immutable, and hashable, and lets
+### slicing, concatenation, and equality checks run at C speed.
+###
 ### No error handling yet, assumptions about input are in the comments.
 
-import copy
+import functools
+import itertools
+
+# numpy is optional: when it's available, candidate words can be generated and
+# checked in bulk as arrays.  Everything else works without it.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# numba is optional too: when it's available (it requires numpy), the Booth
+# least-rotation scan below is compiled to machine code the first time it
+# runs; otherwise the same source is simply interpreted.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+## Building the functions on words that will eventually be turned into Word methods.
+
+
+# Assumes every element of integerList is in range(-128, 128).
+# Encodes a word given as a list of integers into its internal bytes form.
+def encodeWord(integerList):
+    return bytes(letter & 0xFF for letter in integerList)
+
+
+# Inverse of encodeWord: decodes an internal bytes word back into a list of
+# integers.
+def decodeWord(word):
+    return [code - 256 if code > 127 else code for code in word]
+
+
+# 256-entry table sending the byte code of each letter to the byte code of its
+# inverse letter (0, the identity, is its own inverse).  Built once at import.
+inverseTable = bytes((-code) % 256 for code in range(256))
+
+# Cache of rank tables, keyed by the alphabet (as a tuple, so it's hashable).
+# Alphabets are small and few, so the cache never grows noticeably.
+rankTables = {}
+
+
+# Assumes alphabet contains no repeated elements.
+# Returns a dictionary mapping the byte code of each letter of alphabet to its
+# position, computing it only once per alphabet.  Looking a code up in this
+# table replaces the linear scan that alphabet.index() would do.
+def rankTable(alphabet):
+    key = tuple(alphabet)
+    table = rankTables.get(key)
+    if table is None:
+        table = {letter & 0xFF: i for i, letter in enumerate(alphabet)}
+        rankTables[key] = table
+    return table
+
+
+# Cache of 256-entry successor tables, keyed like rankTables.
+nextCodeTables = {}
+
+
+# Assumes alphabet contains no repeated elements.
+# Returns a 256-entry bytes table sending the code of each letter of alphabet
+# except the last to the code of the letter after it (codes outside the
+# alphabet map to themselves).  Built once per alphabet, it turns the
+# "next letter" step of the odometer into a single table lookup.
+def nextCodeTable(alphabet):
+    key = tuple(alphabet)
+    table = nextCodeTables.get(key)
+    if table is None:
+        nextCode = {alphabet[i] & 0xFF: alphabet[i+1] & 0xFF
+                    for i in range(len(alphabet) - 1)}
+        table = bytes(nextCode.get(code, code) for code in range(256))
+        nextCodeTables[key] = table
+    return table
 
-## Building the functions on lists that will eventually be turned into Word methods.
 
 # Assumes n is a positive integer.
 # Creates a symmetrized generating set with n generators and without the identity.
@@ -54,241 +131,605 @@ def standardAlphabet(n):
     return alphabet
 
 
-# Assumes n is an integer such that |n| < len(list).
-# Returns the cyclic shift of a list, rotated left by n (or right
-# by -n, if n is negative).  
-def cyclicShiftLeft(list, n=1):
-    return list[n:] + list[:n]
-
-
-# Returns a list of cyclic shifts of a list.
-# Stops if a nontrivial shift of list is equal to list itself, in order
-# to exclude redundant shifts of periodic lists.
-def cyclicShifts(list):
-    shifts = [list]
-    for i in range(1, len(list)):
-        if cyclicShiftLeft(list, i) == list:
+# Assumes n is an integer such that |n| < len(word).
+# Returns the cyclic shift of a word, rotated left by n (or right
+# by -n, if n is negative).
+def cyclicShiftLeft(word, n=1):
+    return word[n:] + word[:n]
+
+
+# Returns a tuple of cyclic shifts of a word.
+# Stops if a nontrivial shift of word is equal to word itself, in order
+# to exclude redundant shifts of periodic words.
+# Concatenating word with itself up front makes each shift a single slice
+# of the doubled word, instead of two slices and a concatenation.
+# Memoized: the same short words come up again and again as candidate
+# relations, and since the result is an immutable tuple of immutable bytes,
+# every caller can safely share the one cached copy.
+@functools.lru_cache(maxsize=262144)
+def cyclicShifts(word):
+    shifts = [word]
+    doubledWord = word + word
+    for i in range(1, len(word)):
+        shift = doubledWord[i:i+len(word)]
+        if shift == word:
             break
-        shifts.append(cyclicShiftLeft(list, i))
-    return(shifts)
+        shifts.append(shift)
+    return tuple(shifts)
 
 
-# Assumes list is a list of numbers.  
-# Returns the negatives of the numbers in the original list, in reverse order.
-def inverse(list):
-    inverse = []
-    for i in range(1, len(list)+1):
-        inverse.append(-list[len(list)-i])
-    return inverse
+# Assumes word is an encoded bytes word.
+# Returns the inverses of the letters in the original word, in reverse order.
+# translate maps every letter through inverseTable in one C-level pass, and
+# the [::-1] slice reverses in a second, so no Python-level loop remains.
+def inverse(word):
+    return word.translate(inverseTable)[::-1]
 
 
-# Assumes list is a list of numbers.  
-# Returns the list of cyclic shifts and "inverses" of cyclic shifts of list.
-def inverseCyclicShifts(list):
+# Assumes word is an encoded bytes word.
+# Returns the tuple of cyclic shifts and inverses of cyclic shifts of word.
+def inverseCyclicShifts(word):
     shiftsAndInverses = []
-    for shift in cyclicShifts(list):
+    for shift in cyclicShifts(word):
         shiftsAndInverses.append(shift)
         shiftsAndInverses.append(inverse(shift))
-    return shiftsAndInverses
+    return tuple(shiftsAndInverses)
 
 
-# Assumes list is a list of numbers.
-# Returns True if and only if no two successive numbers in list are negatives
-# of each other, where the first element of list is considered to succeed the
-# last element.
-def isCyclicallyReduced(list):
-    for i in range(len(list)):
-        if list[i-1] == -list[i]:
+# Assumes word is an encoded bytes word.
+# Returns True if and only if no two successive letters of word are inverses
+# of each other, where the first letter of word is considered to succeed the
+# last letter.
+def isCyclicallyReduced(word):
+    for i in range(len(word)):
+        if word[i-1] == inverseTable[word[i]]:
             return False
     return True
 
 
-# Assumes: 
-#   - each element of list0 and list1 is a member of alphabet.
+# Assumes:
+#   - each letter of word0 and word1 is a member of alphabet.
 #   - alphabet does not have any repeated elements.
-# Returns True if and only if list0 STRICTLY precedes list1 in shortLex order,
-# where elements are ordered according to alphabet.
-def shortLexPrecedes(list0, list1, alphabet):
-    if list1 == []:
-        return False
-    elif list0 ==  []:
+# Returns True if and only if word0 STRICTLY precedes word1 in shortLex order,
+# where letters are ordered according to alphabet.
+# A flat loop with no recursion frames, slicing, or tuple building: most
+# comparisons are decided within the first few letters, and the rank table is
+# only consulted at the deciding position.
+def shortLexPrecedes(word0, word1, alphabet):
+    if len(word0) != len(word1):
+        return len(word0) < len(word1)
+    for code0, code1 in zip(word0, word1):
+        if code0 != code1:
+            rank = rankTable(alphabet)
+            return rank[code0] < rank[code1]
+    return False
+
+
+# Core scan of Booth's least-rotation algorithm (1980).  doubledWord is a word
+# concatenated with itself, rank is indexable by letter code, and failure is a
+# scratch buffer of len(doubledWord) entries, all -1.  Returns the index of
+# the lexicographically least rotation under rank order.  Written against
+# plain indexing only, so the identical source runs interpreted over bytes
+# and a dict, or compiled by numba over numpy arrays.
+def boothScan(doubledWord, rank, failure):
+    least = 0
+    for j in range(1, len(doubledWord)):
+        code = doubledWord[j]
+        i = failure[j - least - 1]
+        while i != -1 and code != doubledWord[least + i + 1]:
+            if rank[code] < rank[doubledWord[least + i + 1]]:
+                least = j - i - 1
+            i = failure[i]
+        if code != doubledWord[least + i + 1]:
+            if rank[code] < rank[doubledWord[least]]:
+                least = j
+            failure[j - least] = -1
+        else:
+            failure[j - least] = i + 1
+    return least
+
+
+if njit is not None:
+    boothScanCompiled = njit(cache=True)(boothScan)
+
+
+# Cache of 256-entry rank arrays for the compiled scan, keyed like rankTables.
+rankArrays = {}
+
+
+# Array counterpart of rankTable: position of each letter code in alphabet,
+# as a numpy array indexable by code (-1 for codes outside the alphabet).
+def rankArray(alphabet):
+    key = tuple(alphabet)
+    array = rankArrays.get(key)
+    if array is None:
+        array = numpy.full(256, -1, dtype=numpy.int32)
+        for i, letter in enumerate(alphabet):
+            array[letter & 0xFF] = i
+        rankArrays[key] = array
+    return array
+
+
+# Assumes:
+#   - every letter of word is an element of alphabet.
+#   - alphabet contains no repeated elements.
+# Returns the shift amount n for which cyclicShiftLeft(word, n) is
+# lexicographically least among all cyclic shifts of word, where letters are
+# ordered according to alphabet.  Linear in len(word), by way of the failure
+# function boothScan maintains over the doubled word, instead of comparing
+# all len(word)^2 pairs of shifted letters.
+def leastCyclicShiftIndex(word, alphabet):
+    doubledWord = word + word
+    if njit is not None:
+        codes = numpy.frombuffer(doubledWord, dtype=numpy.uint8)
+        failure = numpy.full(len(doubledWord), -1, dtype=numpy.int64)
+        return boothScanCompiled(codes, rankArray(alphabet), failure)
+    return boothScan(doubledWord, rankTable(alphabet), [-1] * len(doubledWord))
+
+
+# Memoized core of canonicalRotation.  Keyed on the word together with the
+# alphabet as a tuple, since lists cannot be dictionary keys.
+@functools.lru_cache(maxsize=262144)
+def canonicalRotationCached(word, alphabetKey):
+    leastShift = cyclicShiftLeft(word, leastCyclicShiftIndex(word, alphabetKey))
+    inverseWord = inverse(word)
+    leastInverseShift = cyclicShiftLeft(inverseWord, leastCyclicShiftIndex(inverseWord, alphabetKey))
+    if shortLexPrecedes(leastInverseShift, leastShift, alphabetKey):
+        return leastInverseShift
+    return leastShift
+
+
+# Assumes:
+#   - every letter of word is an element of alphabet.
+#   - alphabet contains no repeated elements.
+# Returns the canonical representative of word's equivalence class under
+# cyclic shifts and inversion: the shortLex least among all cyclic shifts of
+# word and of its inverse, found with two runs of Booth's algorithm.  Two
+# words are related by shifts and inversion exactly when their canonical
+# rotations are equal, so once a word's canonical rotation is cached, any
+# later equivalence test on it is a single bytes comparison.
+def canonicalRotation(word, alphabet):
+    return canonicalRotationCached(word, tuple(alphabet))
+
+
+# Assumes:
+#   - every letter of word is an element of alphabet.
+#   - alphabet contains no repeated elements.
+# Returns True if and only if word is shortLex least among all its
+# cyclic shifts and their inverses -- that is, exactly when word is the
+# canonical rotation of its own class, which shares the cache above.
+def isCyclicInverselyMinimal(word, alphabet):
+    return word == canonicalRotationCached(word, tuple(alphabet))
+
+
+# Memoized core of makePredicates.  Closures over frozen tables are used
+# rather than exec-generated source: they give the same effect (the alphabet's
+# constants are bound once, outside the hot loop) without building code as
+# strings.
+@functools.lru_cache(maxsize=None)
+def makePredicatesCached(alphabetKey):
+    rank = rankTable(alphabetKey)
+    inverseOf = inverseTable
+
+    def isCyclicallyReducedFixed(word):
+        for i in range(len(word)):
+            if word[i-1] == inverseOf[word[i]]:
+                return False
         return True
-    elif list0[0] != list1[0]:
-        return alphabet.index(list0[0]) < alphabet.index(list1[0])
-    else:
-        return shortLexPrecedes(list0[1:], list1[1:], alphabet)
+
+    def isCyclicInverselyMinimalFixed(word):
+        return word == canonicalRotationCached(word, alphabetKey)
+
+    def shortLexPrecedesFixed(word0, word1):
+        if len(word0) != len(word1):
+            return len(word0) < len(word1)
+        for code0, code1 in zip(word0, word1):
+            if code0 != code1:
+                return rank[code0] < rank[code1]
+        return False
+
+    return isCyclicallyReducedFixed, isCyclicInverselyMinimalFixed, shortLexPrecedesFixed
+
+
+# Assumes alphabet contains no repeated elements.
+# Returns versions of (isCyclicallyReduced, isCyclicInverselyMinimal,
+# shortLexPrecedes) specialized to the given alphabet, which an enumeration
+# loop fetches once at its entry.  The specialized forms skip the per-call
+# alphabet argument, the tuple(alphabet) conversions, and the rank-table
+# cache lookups of the general versions; the factory itself is memoized so
+# each alphabet pays the setup cost once.
+def makePredicates(alphabet):
+    return makePredicatesCached(tuple(alphabet))
+
+
+# Cache of allowed-successor tables, keyed like rankTables.
+allowedCodesTables = {}
+
+
+# Assumes alphabet contains no repeated elements.
+# Returns a dictionary sending the code of each letter of alphabet to the
+# bytes of all letter codes, in alphabet order, except the code of that
+# letter's inverse -- that is, the letters allowed to follow it in a freely
+# reduced word.  Built once per alphabet.
+def allowedCodesTable(alphabet):
+    key = tuple(alphabet)
+    table = allowedCodesTables.get(key)
+    if table is None:
+        codes = encodeWord(alphabet)
+        table = {code: bytes(c for c in codes if c != inverseTable[code])
+                 for code in codes}
+        allowedCodesTables[key] = table
+    return table
 
 
 # Assumes:
-#   - every element of list is an element of alphabet.
+#   - length is a natural number.
 #   - alphabet contains no repeated elements.
-# Returns True if and only if list is shortLex least among all its
-# cyclic shifts and their "inverses".
-def isCyclicInverselyMinimal(list, alphabet):
-    for shift in inverseCyclicShifts(list):
-        if shortLexPrecedes(shift, list, alphabet):
-            return False
-    return True
+# Yields every cyclically reduced word of the given length over alphabet, in
+# shortLex order, without ever constructing a word that fails the check:
+# each position ranges only over the letters allowed after the previous one,
+# and the last position also skips the inverse of the first letter.  This is
+# the "on-line" style of goal 2 -- pruning while building, rather than
+# generating every word and filtering with isCyclicallyReduced afterwards --
+# and it shrinks the search space by a factor of about 2n/(2n-1) per letter.
+def cyclicallyReducedWords(length, alphabet):
+    if length == 0:
+        yield b''
+        return
+    codes = encodeWord(alphabet)
+    allowed = allowedCodesTable(alphabet)
+    buffer = bytearray(length)
+
+    def extend(position):
+        if position == length:
+            yield bytes(buffer)
+            return
+        choices = codes if position == 0 else allowed[buffer[position - 1]]
+        for code in choices:
+            if position == length - 1:
+                firstCode = buffer[0] if length > 1 else code
+                if code == inverseTable[firstCode]:
+                    continue
+            buffer[position] = code
+            yield from extend(position + 1)
+
+    yield from extend(0)
+
+
+# Memoized count of the accepted completions of a partial relation, used to
+# steer validRelationWords.  A partial relation is summarized by the small
+# DFA state (firstCode, prevCode, hasFirst): the first letter (whose
+# recurrence rule 1.d.i demands), the previous letter (whose inverse free
+# reduction forbids), and whether the first letter or its inverse has
+# already reappeared.  With remaining letters still to place, this returns
+# how many completions end in an accepting state -- one where hasFirst holds
+# and the last letter is not the inverse of the first (cyclic reduction at
+# the seam).  The state space is tiny, so the cache stays small.
+@functools.lru_cache(maxsize=None)
+def validRelationSuffixCount(state, remaining, alphabetKey):
+    firstCode, prevCode, hasFirst = state
+    if remaining == 0:
+        return 1 if hasFirst and prevCode != inverseTable[firstCode] else 0
+    allowed = allowedCodesTable(alphabetKey)
+    total = 0
+    for code in allowed[prevCode]:
+        nextState = (firstCode, code,
+                     hasFirst or code == firstCode or code == inverseTable[firstCode])
+        total += validRelationSuffixCount(nextState, remaining - 1, alphabetKey)
+    return total
+
+
+# Assumes:
+#   - length is a natural number.
+#   - alphabet contains no repeated elements.
+# Yields every word of the given length over alphabet, in shortLex order,
+# that is usable as a relation under goals 1.c and 1.d.i: cyclically reduced,
+# and not of the form xw where the rest of the word contains neither the
+# first letter x nor its inverse (such a relation would just make x
+# redundant).  The walk is guided by validRelationSuffixCount: a branch is
+# only entered if at least one accepted completion lies below it, so no dead
+# ends are ever explored -- in contrast to generating every word and
+# filtering afterwards.
+def validRelationWords(length, alphabet):
+    if length == 0:
+        return
+    alphabetKey = tuple(alphabet)
+    codes = encodeWord(alphabet)
+    allowed = allowedCodesTable(alphabet)
+    buffer = bytearray(length)
+
+    def extend(state, position):
+        if position == length:
+            yield bytes(buffer)
+            return
+        firstCode, prevCode, hasFirst = state
+        for code in allowed[prevCode]:
+            nextState = (firstCode, code,
+                         hasFirst or code == firstCode or code == inverseTable[firstCode])
+            if validRelationSuffixCount(nextState, length - position - 1, alphabetKey) == 0:
+                continue
+            buffer[position] = code
+            yield from extend(nextState, position + 1)
+
+    for code in codes:
+        startState = (code, code, False)
+        if validRelationSuffixCount(startState, length - 1, alphabetKey) == 0:
+            continue
+        buffer[0] = code
+        yield from extend(startState, 1)
+
+
+# Assumes:
+#   - length is a natural number.
+#   - alphabet contains no repeated elements.
+# Returns the list of all words of the given length over alphabet, in shortLex
+# order, that are cyclically reduced and cyclically inversely minimal -- the
+# words goals 1.a and 1.c allow as relations.  When numpy is available, all
+# len(alphabet)**length candidate words are held at once as one
+# (number of candidates) x length array of letter ranks, and both checks run
+# as whole-array operations; only the survivors are converted back to bytes
+# words.  Without numpy the pruned generator supplies the cyclically reduced
+# candidates and only minimality is checked per word.
+def cyclicInverselyMinimalWords(length, alphabet):
+    if length == 0:
+        return [b'']
+    alphabetSize = len(alphabet)
+    if numpy is None:
+        return [word for word in cyclicallyReducedWords(length, alphabet)
+                if isCyclicInverselyMinimal(word, alphabet)]
+    # Letter codes and inverses expressed in rank space, so that ordinary
+    # array comparison agrees with the alphabet's order.
+    alphabetCodes = numpy.array([letter & 0xFF for letter in alphabet], dtype=numpy.uint8)
+    rank = rankTable(alphabet)
+    inverseRank = numpy.array([rank[inverseTable[letter & 0xFF]] for letter in alphabet],
+                              dtype=numpy.int8)
+    # Rows of ranked are all candidate words, in shortLex order.
+    ranked = numpy.indices((alphabetSize,) * length).reshape(length, -1).T.astype(numpy.int8)
+    # Cyclic reduction: no letter may be followed (cyclically) by its inverse.
+    reduced = (numpy.roll(ranked, 1, axis=1) != inverseRank[ranked]).all(axis=1)
+    ranked = ranked[reduced]
+    rows = numpy.arange(len(ranked))
+
+    # Returns, rowwise, whether each row of array0 lexicographically precedes
+    # the corresponding row of array1 (rows have equal length, so this is
+    # shortLex order).
+    def rowsPrecede(array0, array1):
+        unequal = array0 != array1
+        firstUnequal = unequal.argmax(axis=1)
+        return unequal.any(axis=1) & (array0[rows, firstUnequal] < array1[rows, firstUnequal])
+
+    # Running minimum over all cyclic shifts of each word and of its inverse.
+    least = ranked
+    inverseRanked = inverseRank[ranked][:, ::-1]
+    for i in range(length):
+        for shifted in (numpy.roll(ranked, -i, axis=1), numpy.roll(inverseRanked, -i, axis=1)):
+            precedes = rowsPrecede(shifted, least)
+            least = numpy.where(precedes[:, None], shifted, least)
+    minimal = (least == ranked).all(axis=1)
+    return [row.tobytes() for row in alphabetCodes[ranked[minimal]]]
 
 
 # Assumes:
-#   - every element of list is also an element of alphabet.
+#   - every letter of word is also an element of alphabet.
 #   - alphabet contains no repeated elements.
-# Returns the "odometer" successor of list: if the list
-# is the lexicographically greatest possible list of that length
+# Returns the "odometer" successor of word: if the word
+# is the lexicographically greatest possible word of that length
 # according to alphabet, the odometer rolls over and its successor
-# is the lexicographically-least list of the same length.
-def odometerSuccessor(list, alphabet):
-    if list == []:
-        return []
-    elif list[-1] != alphabet[-1]:
-        return list[:len(list)-1] + [alphabet[alphabet.index(list[-1])+1]]
-    else:
-        return odometerSuccessor(list[:len(list)-1], alphabet) + [alphabet[0]]
+# is the lexicographically-least word of the same length.
+# A single backward pass over a mutable bytearray, carrying past each
+# trailing last letter -- amortized constant work per successor, with none
+# of the recursion or per-level slicing of the old version.
+def odometerSuccessor(word, alphabet):
+    firstCode = alphabet[0] & 0xFF
+    lastCode = alphabet[-1] & 0xFF
+    buffer = bytearray(word)
+    i = len(buffer) - 1
+    while i >= 0 and buffer[i] == lastCode:
+        buffer[i] = firstCode
+        i -= 1
+    if i >= 0:
+        buffer[i] = nextCodeTable(alphabet)[buffer[i]]
+    return bytes(buffer)
 
 
 # Assumes:
-#   - every element of list is also an element of alphabet.
+#   - every letter of word is also an element of alphabet.
 #   - alphabet contains no repeated elements.
-# Returns the shortLex successor of list over alphabet.
-def shortLexSuccessor(list, alphabet):
-    if list == []:
-        return [alphabet[0]]
-    else:
-        isAllLastLetter = True
-        for i in range(len(list)):
-            if list[i] != alphabet[-1]:
-                isAllLastLetter = False
-        if isAllLastLetter:
-            return [alphabet[0]] + odometerSuccessor(list, alphabet)
-        else:
-            return odometerSuccessor(list, alphabet)
+# Returns the shortLex successor of word over alphabet.
+# Same backward carry pass as odometerSuccessor; the carry running off the
+# front is exactly the "all last letter" case, in which the word rolls over
+# and grows by one leading first letter, so no separate scan is needed.
+def shortLexSuccessor(word, alphabet):
+    firstCode = alphabet[0] & 0xFF
+    lastCode = alphabet[-1] & 0xFF
+    buffer = bytearray(word)
+    i = len(buffer) - 1
+    while i >= 0 and buffer[i] == lastCode:
+        buffer[i] = firstCode
+        i -= 1
+    if i < 0:
+        return bytes([firstCode]) + bytes(buffer)
+    buffer[i] = nextCodeTable(alphabet)[buffer[i]]
+    return bytes(buffer)
 
 
 # Assumes k and n are positive integers.
-# Returns the list of non-decreasing lists of positive integers
-# whose sum is n.
+# Returns the tuple of non-decreasing tuples of positive integers starting
+# with k whose sum is n.
+# Memoized: the same small (k, n) subproblems recur throughout the recursion
+# and across the outer loop of nondecreasingPartitions, and each partition is
+# an immutable tuple allocated exactly once.
+@functools.lru_cache(maxsize=None)
 def nondecreasingPartitionsStartingWith(k, n):
-    partitions = []
     if k == n:
-        partitions.append([n])
+        return ((n,),)
     elif k < n:
-        for i in range(k, n-k+1):
-            for smallerPartition in nondecreasingPartitionsStartingWith(i, n-k):
-                partitions.append([k] + smallerPartition)
-    return partitions
+        return tuple((k,) + smallerPartition
+                     for i in range(k, n-k+1)
+                     for smallerPartition in nondecreasingPartitionsStartingWith(i, n-k))
+    else:
+        return ()
 
 
 # Assumes n is a positive integer.
-# Returns the list of non-decreasing lists of positive integers
+# Returns the list of non-decreasing tuples of positive integers
 # whose sum is n.
 def nondecreasingPartitions(n):
-    partitions = []
-    for i in range(1, n+1):
-        partitions = partitions + nondecreasingPartitionsStartingWith(i, n)
-    return partitions
+    return [partition
+            for i in range(1, n+1)
+            for partition in nondecreasingPartitionsStartingWith(i, n)]
 
 
 # Ad-hoc auxiliary function
 # Assumes list is a list of numbers.
-# Returns the list of nonzero absolute values of elements of list.
+# Returns the list of nonzero absolute values of elements of list, in order
+# of first appearance.  Membership is tracked in a set, so the whole pass is
+# linear instead of rescanning the output list for every element.
 def positiveWithoutDuplicates(list):
     positives = []
+    seen = set()
     for number in list:
-        if number != 0 and abs(number) not in positives:
-            positives.append(abs(number))
+        absoluteValue = abs(number)
+        if absoluteValue != 0 and absoluteValue not in seen:
+            seen.add(absoluteValue)
+            positives.append(absoluteValue)
     return positives
 
 
 class Word:
+    # Words are created in huge numbers during enumeration; __slots__ drops
+    # the per-instance __dict__, roughly halving their memory footprint.
+    __slots__ = ('alphabet', 'asBytes')
+
     def __init__(self, alphabet, integerList):
         self.alphabet = alphabet
-        self.asIntegerList = integerList
+        self.asBytes = encodeWord(integerList)
 
     # Assumes that all elements of alphabet are in range(-26, 27).
+    # Letters are collected in a list and joined once at the end, instead of
+    # growing a string by repeated concatenation.
     def __str__(self):
-        wordString = ''
-        for integer in self.asIntegerList:
-            if integer > 0:
-                wordString = wordString + chr(96 + integer)
-            elif integer == 0:
-                wordString = wordString + "1"
-            else:
-                wordString = wordString + chr(96 - integer) + "'"
-        return wordString
-            
-    # Assumes that all elements of alphabet are in range(-26, 27).
-    def __repr__(self):
-        wordString = ''
-        for integer in self.asIntegerList:
+        letters = []
+        for integer in decodeWord(self.asBytes):
             if integer > 0:
-                wordString = wordString + chr(96 + integer)
+                letters.append(chr(96 + integer))
             elif integer == 0:
-                wordString = wordString + "1"
+                letters.append("1")
             else:
-                wordString = wordString + chr(96 - integer) + "'"
-        return wordString
+                letters.append(chr(96 - integer) + "'")
+        return ''.join(letters)
+
+    __repr__ = __str__
 
     def cyclicShiftLeft(self, n=1):
-        return Word(self.alphabet, cyclicShiftLeft(self.asIntegerList, n))
+        return Word(self.alphabet, decodeWord(cyclicShiftLeft(self.asBytes, n)))
 
     def cyclicShifts(self):
         shifts = []
-        for shiftedIntegerList in cyclicShifts(self.asIntegerList):
-            shifts.append(Word(self.alphabet, shiftedIntegerList))
+        for shiftedWord in cyclicShifts(self.asBytes):
+            shifts.append(Word(self.alphabet, decodeWord(shiftedWord)))
         return shifts
 
 
 class Presentation:
+    # Same memory reasoning as Word.__slots__.
+    __slots__ = ('generators', 'relations')
+
+    # relations may be Word objects or encoded bytes words.  Each relation is
+    # stored as the canonical rotation of its class (goal 1.a) and the stored
+    # tuple is sorted in shortLex order (goal 1.b), so two presentations that
+    # differ only by shifting/inverting relations or reordering them come out
+    # identical.  A presentation's identity is then exactly
+    # (generators, relations), which is what __eq__ and __hash__ use --
+    # making "have we already seen this presentation?" a constant-time set
+    # membership check for the enumeration.
     def __init__(self, generators, relations):
         self.generators = generators
-        self.relations = relations
+        rank = rankTable(generators)
+        canonicalRelations = [canonicalRotation(relation.asBytes if isinstance(relation, Word)
+                                                else bytes(relation), generators)
+                              for relation in relations]
+        canonicalRelations.sort(key=lambda word: (len(word), [rank[code] for code in word]))
+        self.relations = tuple(canonicalRelations)
+
+    def __eq__(self, other):
+        return (isinstance(other, Presentation)
+                and tuple(self.generators) == tuple(other.generators)
+                and self.relations == other.relations)
+
+    def __hash__(self):
+        return hash((tuple(self.generators), self.relations))
 
     # Assumes that all elements of generators are in range(-26, 27).
+    # Joining the generator letters and relation strings with ", " also does
+    # away with the old append-then-strip-the-trailing-comma dance.
     def __str__(self):
-        presentationString = '<'
-        hasPositiveGenerators = False
-        for positiveGenerator in positiveWithoutDuplicates(self.generators):
-            presentationString += chr(96 + positiveGenerator) + ", "
-        if presentationString[-2] == ',':
-            presentationString = presentationString[:-2]
-        presentationString += " | "
-        for relation in self.relations:
-            presentationString += str(relation) + ", "
-        if presentationString[-2] == ',':
-            presentationString = presentationString[:-2]
-        presentationString +=">"
-        return presentationString
-        
-    # Assumes that all elements of generators are in range(-26, 27).
-    def __repr__(self):
-        presentationString = '<'
-        hasPositiveGenerators = False
-        for positiveGenerator in positiveWithoutDuplicates(self.generators):
-            presentationString += chr(96 + positiveGenerator) + ", "
-        if presentationString[-2] == ',':
-            presentationString = presentationString[:-2]
-        presentationString += " | "
-        for relation in self.relations:
-            presentationString += str(relation) + ", "
-        if presentationString[-2] == ',':
-            presentationString = presentationString[:-2]
-        presentationString +=">"
-        return presentationString
+        generatorLetters = [chr(96 + positiveGenerator)
+                            for positiveGenerator in positiveWithoutDuplicates(self.generators)]
+        relationStrings = [str(Word(self.generators, decodeWord(relation)))
+                           for relation in self.relations]
+        return "<" + ", ".join(generatorLetters) + " | " + ", ".join(relationStrings) + ">"
+
+    __repr__ = __str__
 
 # Assumes k and n are natural numbers.
 # Returns a list of presentations with k generators and combined relation
 # length of n.  For each partition of n, it lists all words of length n
 # and then breaks them into multiple words following the partition.
-# It's the "stupid" way of enumerating presentations because it doesn't
-# weed out obviously redundant presentations, either before or after
-# generating them.
-# After this is done, a slightly smarter (but still stupid) enumeration
-# can be built that uses this basic scheme, but doesn't add a presentation
-# to the list unless it passes a series of checks that ensures it's not
-# equivalent to a previous presentation in an obvious way.
+# It's still the "stupid" way of enumerating presentations because it builds
+# every candidate instead of pruning while building -- but since Presentation
+# now canonicalizes and sorts its relations, keeping a set of the
+# presentations seen so far drops the obviously redundant duplicates with a
+# constant-time membership check each.
 def stupidEnumeratePresentations(k, n):
-    pass
+    alphabet = standardAlphabet(k)
+    if n == 0:
+        return [Presentation(alphabet, [])]
+    presentations = []
+    seen = set()
+    for partition in nondecreasingPartitions(n):
+        word = bytes([alphabet[0] & 0xFF]) * n
+        for i in range(len(alphabet) ** n):
+            relations = []
+            start = 0
+            for partLength in partition:
+                relations.append(word[start:start+partLength])
+                start += partLength
+            presentation = Presentation(alphabet, relations)
+            if presentation not in seen:
+                seen.add(presentation)
+                presentations.append(presentation)
+            word = odometerSuccessor(word, alphabet)
+    return presentations
+
+
+# Assumes k and n are natural numbers.
+# The slightly smarter (but still stupid) enumeration promised above: same
+# partition scheme as stupidEnumeratePresentations, but each relation is
+# drawn from validRelationWords -- so it is cyclically reduced and does not
+# obviously make a generator redundant (goals 1.c and 1.d.i) by
+# construction -- and kept only if cyclically inversely minimal (goal 1.a).
+# Presentation sorts the relations (goal 1.b), and the seen set drops the
+# remaining duplicates.
+def enumeratePresentations(k, n):
+    alphabet = standardAlphabet(k)
+    if n == 0:
+        return [Presentation(alphabet, [])]
+    isMinimal = makePredicates(alphabet)[1]
+    presentations = []
+    seen = set()
+    for partition in nondecreasingPartitions(n):
+        candidatesByLength = {partLength: [word
+                                           for word in validRelationWords(partLength, alphabet)
+                                           if isMinimal(word)]
+                              for partLength in set(partition)}
+        candidateLists = [candidatesByLength[partLength] for partLength in partition]
+        for relations in itertools.product(*candidateLists):
+            presentation = Presentation(alphabet, relations)
+            if presentation not in seen:
+                seen.add(presentation)
+                presentations.append(presentation)
+    return presentations
 
 
 def main():
@@ -347,32 +788,32 @@ def main():
     # # False
     # # True
 
-    list = [0, 0, 0]
+    word = encodeWord([0, 0, 0])
     alphabet = [0, 1]
 
     # for i in range(20):
-    #     print(list)
-    #     list = odometerSuccessor(list, alphabet)
+    #     print(decodeWord(word))
+    #     word = odometerSuccessor(word, alphabet)
 
-    # list = []
+    # word = b''
     # for i in range(20):
-    #     print(list)
-    #     list = shortLexSuccessor(list, alphabet)
+    #     print(decodeWord(word))
+    #     word = shortLexSuccessor(word, alphabet)
 
     # print(nondecreasingPartitionsStartingWith(4, 5))
     # print(nondecreasingPartitionsStartingWith(2, 4))
     # print(nondecreasingPartitionsStartingWith(1, 4))
-    # # []
-    # # [[2, 2]]
-    # # [[1, 1, 1, 1], [1, 1, 2], [1, 3]]
+    # # ()
+    # # ((2, 2),)
+    # # ((1, 1, 1, 1), (1, 1, 2), (1, 3))
 
     # print(nondecreasingPartitionsStartingWith(1, 6))
-    # # [[1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 2], [1, 1, 1, 3]
-    # #  [1, 1, 2, 2], [1, 1, 4], [1, 2, 3], [1, 5]]
+    # # ((1, 1, 1, 1, 1, 1), (1, 1, 1, 1, 2), (1, 1, 1, 3)
+    # #  (1, 1, 2, 2), (1, 1, 4), (1, 2, 3), (1, 5))
 
     # print(nondecreasingPartitions(5))
-    # # [[1, 1, 1, 1, 1], [1, 1, 1, 2], [1, 1, 3], [1, 2, 2]
-    # #  [1, 4], [2, 3], [5]]
+    # # [(1, 1, 1, 1, 1), (1, 1, 1, 2), (1, 1, 3), (1, 2, 2)
+    # #  (1, 4), (2, 3), (5)]
 
     # word0 = Word([0, 1, -1, 2, -2], [0, 1, 2, -1, -2])
     # # print(word0)
@@ -390,8 +831,8 @@ def main():
     # presentation2 = Presentation(standardAlphabet(3), [word1, word2, word3])
     # print(presentation0)
     # print([presentation0, presentation1, presentation2])
-    # # <a, b, c | ab'ca>
-    # # [<a, b, c, | a'ca>, <a, b, c | >, <a, b, c | a'ca, cabbc, abc>]
+    # # <a, b, c | aab'c>
+    # # [<a, b, c | aab'c>, <a, b, c | >, <a, b, c | abc, aab'c, abbcc>]
 
     # print(word2.cyclicShiftLeft())
     # print(word2.cyclicShiftLeft(2))